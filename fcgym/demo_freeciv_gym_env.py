@@ -6,39 +6,156 @@ Usage (from repo root):
 
 What it shows:
 - `env.reset()` returns (obs, info) where obs is a Dict of fixed-shape arrays.
-- Actions are chosen by sampling indices where `info["action_mask"] == 1`.
+- Actions are chosen by sampling uniformly from `[0, info["num_legal_actions"])`;
+  legal actions are always packed at the front, so this matches sampling
+  indices where `info["action_mask"] == 1` without scanning the mask.
 - `info["legal_actions"][i]` encodes one action as:
     [action_type, actor_slot, target, sub_target]
 
 Notes:
 - `fcgym` uses global Freeciv state, so run only 1 env per process.
-  For parallelism, use subprocess-based vector envs (e.g. AsyncVectorEnv).
+  For parallelism, use subprocess-based vector envs (e.g. FreecivSubprocVecEnv);
+  `--num-envs N` runs N envs, each in its own spawned worker process.
+  Add `--pool` to step them EnvPool-style: each iteration only waits for the
+  first `--batch-size` envs to finish, so slow turns don't stall the rest.
 """
 
 from __future__ import annotations
 
 import argparse
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING
 
 import numpy as np
+from numpy.random import PCG64DXSM, Generator, SeedSequence
 
-from freeciv_gym_env import FcActionType, FreecivGymEnv
+# The env modules (gymnasium, CFFI cdef parsing) are imported where they are
+# first needed so that `--help` and argument errors return immediately.
+if TYPE_CHECKING:
+    from freeciv_gym_env import FreecivGymEnv
+
+
+@lru_cache(maxsize=None)
+def _action_name_by_id() -> dict:
+    from freeciv_gym_env import FcActionType
+
+    return {m.value: m.name for m in FcActionType}
 
 
 def _format_action(env: FreecivGymEnv, action_index: int, info: dict) -> str:
     row = info["legal_actions"][action_index]
-    action_type_id = int(row[0])
-    try:
-        action_type_name = FcActionType(action_type_id).name
-    except ValueError:
-        action_type_name = str(action_type_id)
+    action_type_id, actor_slot, target, sub_target = int(row[0]), int(row[1]), int(row[2]), int(row[3])
+    action_type_name = _action_name_by_id().get(action_type_id, str(action_type_id))
 
     decoded = env._decode_action(action_index)
     return (
-        f"idx={action_index} legal_row={row.tolist()} "
+        f"idx={action_index} legal_row=[{action_type_id}, {actor_slot}, {target}, {sub_target}] "
         f"type={action_type_name} decoded={decoded}"
     )
 
 
+def _uniform_stream(rng: Generator, block: int = 4096):
+    """Yield floats in [0, 1), drawn from rng in blocks to amortize call overhead."""
+    while True:
+        yield from rng.random(block).tolist()
+
+
+def _should_log(args: argparse.Namespace, t: int) -> bool:
+    return args.log_every > 0 and t % args.log_every == 0
+
+
+def _make_env(args: argparse.Namespace) -> FreecivGymEnv:
+    from freeciv_gym_env import FreecivGymEnv
+
+    return FreecivGymEnv(
+        ruleset=args.ruleset,
+        map_width=args.map_width,
+        map_height=args.map_height,
+        num_ai_players=args.num_ai_players,
+        ai_skill_level=args.ai_skill_level,
+        fog_of_war=args.fog_of_war,
+        max_legal_actions=args.max_legal_actions,
+        render_mode=None,
+        # Observations and info are never kept across steps here, and the
+        # vector wrappers copy them out of the worker, so skip the per-step copies
+        copy_obs=False,
+        copy_info=False,
+    )
+
+
+def _run_vector(args: argparse.Namespace, rng: Generator) -> int:
+    from freeciv_vec_env import FreecivSubprocVecEnv
+
+    # Workers are spawned, so each gets a fresh interpreter (and thus fresh
+    # global Freeciv state); fork is unsafe once the parent has touched the library.
+    envs = FreecivSubprocVecEnv([partial(_make_env, args) for _ in range(args.num_envs)])
+
+    try:
+        obs, info = envs.reset(seed=args.seed)
+
+        print(f"Vector env: num_envs={envs.num_envs}")
+        for key, value in obs.items():
+            print(f"  {key}: shape={value.shape} dtype={value.dtype}")
+        print("  num_legal_actions:", info["num_legal_actions"].tolist())
+        print(
+            f"  controlled entities: units={np.count_nonzero(obs['unit_mask'], axis=1).tolist()} "
+            f"cities={np.count_nonzero(obs['city_mask'], axis=1).tolist()}"
+        )
+
+        total_reward = 0.0
+        for t in range(args.steps):
+            # One draw for the whole batch; envs with no legal actions get 0 (NOOP)
+            actions = rng.integers(np.maximum(info["num_legal_actions"], 1))
+            log_step = _should_log(args, t)
+            if log_step:
+                print(f"\nStep {t}: turns={info['turn'].tolist()} actions={actions.tolist()}")
+
+            obs, reward, terminated, truncated, info = envs.step(actions)
+            total_reward += float(reward.sum())
+            if log_step:
+                print(
+                    f"  rewards={np.round(reward, 4).tolist()} terminated={terminated.tolist()} "
+                    f"truncated={truncated.tolist()} num_legal={info['num_legal_actions'].tolist()}"
+                )
+
+        print(f"\nRan {args.steps} vector steps: total_reward={total_reward:.4f}")
+        return 0
+    finally:
+        envs.close()
+
+
+def _run_pool(args: argparse.Namespace, rng: Generator) -> int:
+    from freeciv_vec_env import AsyncPool
+
+    pool = AsyncPool(
+        [partial(_make_env, args) for _ in range(args.num_envs)],
+        batch_size=args.batch_size,
+    )
+
+    try:
+        pool.async_reset(seed=args.seed)
+        print(f"Async pool: num_envs={pool.num_envs} batch_size={pool.batch_size}")
+
+        total_reward = 0.0
+        for t in range(args.steps):
+            obs, reward, terminated, truncated, infos, env_ids = pool.recv()
+            num_legal = np.array([info["num_legal_actions"] for info in infos])
+            actions = rng.integers(np.maximum(num_legal, 1))
+            total_reward += float(reward.sum())
+            if _should_log(args, t):
+                print(
+                    f"\nStep {t}: env_ids={env_ids.tolist()} rewards={np.round(reward, 4).tolist()} "
+                    f"terminated={terminated.tolist()} truncated={truncated.tolist()} "
+                    f"num_legal={[info['num_legal_actions'] for info in infos]}"
+                )
+            pool.send(actions, env_ids)
+
+        print(f"\nRan {args.steps} pool batches: total_reward={total_reward:.4f}")
+        return 0
+    finally:
+        pool.close()
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Demo for FreecivGymEnv (fcgym).")
     parser.add_argument("--ruleset", default="civ2civ3")
@@ -51,20 +168,24 @@ def main() -> int:
     parser.add_argument("--no-fog-of-war", dest="fog_of_war", action="store_false")
     parser.add_argument("--max-legal-actions", type=int, default=1024)
     parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--num-envs", type=int, default=1,
+                        help="Number of envs; >1 steps them in subprocess workers via FreecivSubprocVecEnv.")
+    parser.add_argument("--pool", action="store_true",
+                        help="With --num-envs > 1, use the async send/recv AsyncPool instead of FreecivSubprocVecEnv.")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Envs returned per AsyncPool.recv() (default: max(1, num_envs // 2)).")
+    parser.add_argument("--log-every", type=int, default=1,
+                        help="Print every Nth step (0 = only print the final summary).")
     args = parser.parse_args()
 
-    rng = np.random.default_rng(args.seed)
+    rng = Generator(PCG64DXSM(SeedSequence(args.seed)))
 
-    env = FreecivGymEnv(
-        ruleset=args.ruleset,
-        map_width=args.map_width,
-        map_height=args.map_height,
-        num_ai_players=args.num_ai_players,
-        ai_skill_level=args.ai_skill_level,
-        fog_of_war=args.fog_of_war,
-        max_legal_actions=args.max_legal_actions,
-        render_mode=None,
-    )
+    if args.num_envs > 1:
+        if args.pool:
+            return _run_pool(args, rng)
+        return _run_vector(args, rng)
+
+    env = _make_env(args)
 
     try:
         obs, info = env.reset(seed=args.seed)
@@ -79,26 +200,40 @@ def main() -> int:
         print("  action_mask shape:", info["action_mask"].shape, "dtype:", info["action_mask"].dtype)
         print("  legal_actions shape:", info["legal_actions"].shape, "dtype:", info["legal_actions"].dtype)
 
-        num_units = int(obs["unit_mask"].sum())
-        num_cities = int(obs["city_mask"].sum())
+        num_units = int(np.count_nonzero(obs["unit_mask"]))
+        num_cities = int(np.count_nonzero(obs["city_mask"]))
         print(f"\nControlled entities: units={num_units}, cities={num_cities}")
 
+        # Shapes and the info layout are fixed after reset, so only the
+        # legal-action count is read per step; the bound methods are looked
+        # up once.
+        step = env.step
+        next_uniform = _uniform_stream(rng).__next__
+        n = info["num_legal_actions"]
+        steps_run = 0
+        total_reward = 0.0
         for t in range(args.steps):
-            valid = np.flatnonzero(info["action_mask"] > 0)
-            if valid.size == 0:
+            if n == 0:
                 print("No valid actions; stopping.")
                 break
 
-            action_index = int(rng.choice(valid))
-            print(f"\nStep {t}: turn={info.get('turn')} " + _format_action(env, action_index, info))
+            action_index = min(int(next_uniform() * n), n - 1)
+            log_step = _should_log(args, t)
+            if log_step:
+                print(f"\nStep {t}: turn={info.get('turn')} " + _format_action(env, action_index, info))
 
-            obs, reward, terminated, truncated, info = env.step(action_index)
-            print(f"  reward={reward:.4f} terminated={terminated} truncated={truncated} num_legal={info['num_legal_actions']}")
+            obs, reward, terminated, truncated, info = step(action_index)
+            n = info["num_legal_actions"]
+            steps_run += 1
+            total_reward += reward
+            if log_step:
+                print(f"  reward={reward:.4f} terminated={terminated} truncated={truncated} num_legal={n}")
 
             if terminated or truncated:
                 print("Episode ended.")
                 break
 
+        print(f"\nRan {steps_run} steps: total_reward={total_reward:.4f}")
         return 0
     finally:
         env.close()
@@ -696,6 +696,63 @@ void fcgym_free_observation(FcObservation *obs)
     memset(obs, 0, sizeof(*obs));
 }
 
+void fcgym_fill_map_channels(const FcObservation *obs, uint8_t *out,
+                             int width, int height)
+{
+    if (out == NULL || width <= 0 || height <= 0) {
+        return;
+    }
+
+    size_t plane = (size_t)width * height;
+    memset(out, 0, FCGYM_MAP_CHANNELS * plane);
+
+    if (obs == NULL || obs->tiles == NULL || obs->num_tiles <= 0) {
+        return;
+    }
+
+    /* Crop to the smaller of the game map and the output buffer */
+    int rows = obs->map_ysize < height ? obs->map_ysize : height;
+    int cols = obs->map_xsize < width ? obs->map_xsize : width;
+    int controlled = obs->controlled_player;
+
+    /* Only rows fully present in the tile array */
+    if (obs->map_xsize > 0 && rows > obs->num_tiles / obs->map_xsize) {
+        rows = obs->num_tiles / obs->map_xsize;
+    }
+
+    /*
+     * Every channel is computed with 0x00/0xFF masks rather than branches,
+     * so the loop body doesn't branch on tile contents.
+     * FC_MASK(c) is 0xFF when c is true, 0x00 otherwise.
+     */
+#define FC_MASK(c) ((uint8_t)-(uint8_t)((c) != 0))
+    for (int y = 0; y < rows; y++) {
+        const FcTileObs *row = obs->tiles + (size_t)y * obs->map_xsize;
+        uint8_t *px = out + (size_t)y * width;
+
+        for (int x = 0; x < cols; x++) {
+            const FcTileObs *t = &row[x];
+            uint8_t explored = FC_MASK(t->explored);
+            uint8_t owned = explored & FC_MASK(t->owner >= 0);
+            uint8_t own = FC_MASK(t->owner == controlled);
+
+            /* Channel 0: visibility (255=visible, 128=explored, 0=unknown) */
+            px[x] = FC_MASK(t->visible) | (explored & 128);
+
+            /* Remaining channels are only set for explored tiles */
+            px[x + 1 * plane] = explored & FC_MASK(t->terrain >= 0) & (uint8_t)t->terrain;
+            px[x + 2 * plane] = explored & FC_MASK(t->extras & 0x01);  /* road */
+            px[x + 3 * plane] = explored & FC_MASK(t->extras & 0x02);  /* irrigation */
+            px[x + 4 * plane] = explored & FC_MASK(t->extras & 0x04);  /* mine */
+            px[x + 5 * plane] = owned & own;                           /* ownership_self */
+            px[x + 6 * plane] = owned & ~own;                          /* ownership_enemy */
+            px[x + 7 * plane] = explored & FC_MASK(t->has_city);
+            px[x + 8 * plane] = explored & FC_MASK(t->has_unit);
+        }
+    }
+#undef FC_MASK
+}
+
 void fcgym_get_valid_actions(FcValidActions *actions)
 {
     if (actions == NULL || !fcgym_game_running) {
@@ -248,6 +248,21 @@ void fcgym_get_observation(FcObservation *obs);
  */
 void fcgym_free_observation(FcObservation *obs);
 
+/*
+ * Number of channels written by fcgym_fill_map_channels.
+ */
+#define FCGYM_MAP_CHANNELS 9
+
+/*
+ * Render an observation's tiles into a channel-major uint8 buffer of
+ * FCGYM_MAP_CHANNELS * height * width bytes. Channels: visibility, terrain,
+ * road, irrigation, mine, ownership_self, ownership_enemy, city, unit.
+ * Tiles beyond width/height are cropped; the rest of the buffer is zeroed.
+ * Only reads obs, so it does not touch game state.
+ */
+void fcgym_fill_map_channels(const FcObservation *obs, uint8_t *out,
+                             int width, int height);
+
 /*
  * Get valid actions for the controlled player.
  * Caller must provide allocated FcValidActions.
@@ -0,0 +1,40 @@
+"""
+Build the compiled CFFI bindings for fcgym (out-of-line API mode).
+
+Usage (from fcgym/, after `make shared` has produced libfcgym.so):
+  python3 fcgym_build.py
+
+This writes the _fcgym extension module next to this script. When it is
+importable, freeciv_gym_env uses it instead of parsing the cdef and
+dlopen()ing libfcgym.so at import time (ABI mode), so struct field access
+compiles to direct loads instead of going through CFFI's ABI layer.
+"""
+
+import os
+
+from cffi import FFI
+
+from fcgym_cdef import FCGYM_CDEF
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ffibuilder = FFI()
+ffibuilder.cdef(FCGYM_CDEF)
+ffibuilder.set_source(
+    "_fcgym",
+    """
+    #include "fcgym.h"
+
+    /* fcgym.h declares these as anonymous structs; the cdef names them */
+    typedef __typeof__(((FcValidActions *)0)->unit_actions[0]) FcUnitActions;
+    typedef __typeof__(((FcValidActions *)0)->city_actions[0]) FcCityActions;
+    """,
+    include_dirs=[SCRIPT_DIR],
+    library_dirs=[SCRIPT_DIR],
+    libraries=["fcgym"],
+    extra_link_args=[f"-Wl,-rpath,{SCRIPT_DIR}"],
+)
+
+
+if __name__ == "__main__":
+    ffibuilder.compile(tmpdir=SCRIPT_DIR, verbose=True)
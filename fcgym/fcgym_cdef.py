@@ -0,0 +1,158 @@
+"""
+CFFI declarations for the fcgym C API.
+
+Shared by freeciv_gym_env.py (ABI mode, parsed at import) and
+fcgym_build.py (API mode, compiled into the _fcgym extension).
+
+IMPORTANT: These must match fcgym.h exactly for memory layout.
+"""
+
+FCGYM_CDEF = """
+    typedef struct {
+        const char *ruleset;
+        int map_xsize;
+        int map_ysize;
+        int num_ai_players;
+        int ai_skill_level;
+        unsigned int seed;
+        bool fog_of_war;
+    } FcGameConfig;
+
+    typedef struct {
+        int terrain;
+        int owner;
+        bool has_city;
+        bool has_unit;
+        bool visible;
+        bool explored;
+        int8_t extras;
+    } FcTileObs;
+
+    typedef struct {
+        int id;
+        int type;
+        int owner;
+        int tile_index;
+        int hp;
+        int max_hp;
+        int moves_left;
+        int veteran_level;
+        bool fortified;
+    } FcUnitObs;
+
+    typedef struct {
+        int id;
+        int owner;
+        int tile_index;
+        int size;
+        int food_stock;
+        int shield_stock;
+        int producing_type;
+        bool producing_is_unit;
+        int turns_to_complete;
+    } FcCityObs;
+
+    typedef struct {
+        int index;
+        bool is_alive;
+        bool is_ai;
+        int gold;
+        int tax_rate;
+        int science_rate;
+        int luxury_rate;
+        int researching;
+        int research_bulbs;
+        int num_cities;
+        int num_units;
+        int score;
+    } FcPlayerObs;
+
+    typedef struct {
+        int map_xsize;
+        int map_ysize;
+
+        int turn;
+        int year;
+        int phase;
+        int current_player;
+        int controlled_player;
+
+        FcTileObs *tiles;
+        int num_tiles;
+
+        FcUnitObs *units;
+        int num_units;
+        int max_units;
+
+        FcCityObs *cities;
+        int num_cities;
+        int max_cities;
+
+        FcPlayerObs *players;
+        int num_players;
+
+        bool game_over;
+        int winner;
+    } FcObservation;
+
+    typedef struct {
+        int unit_id;
+        bool can_move[8];
+        int attackable_tiles[8];
+        int num_attackable_tiles;
+        bool can_fortify;
+        bool can_build_city;
+        bool can_build_road;
+        bool can_build_irrigation;
+        bool can_build_mine;
+        bool can_disband;
+    } FcUnitActions;
+
+    typedef struct {
+        int city_id;
+        int *buildable_units;
+        int num_buildable_units;
+        int *buildable_buildings;
+        int num_buildable_buildings;
+        bool can_buy;
+    } FcCityActions;
+
+    typedef struct {
+        FcUnitActions *unit_actions;
+        int num_unit_actions;
+
+        FcCityActions *city_actions;
+        int num_city_actions;
+
+        int *researchable_techs;
+        int num_researchable_techs;
+
+        bool can_end_turn;
+    } FcValidActions;
+
+    typedef struct {
+        int type;
+        int actor_id;
+        int target_id;
+        int sub_target;
+    } FcAction;
+
+    typedef struct {
+        float reward;
+        bool done;
+        bool truncated;
+        const char *info;
+    } FcStepResult;
+
+    int fcgym_init(void);
+    void fcgym_shutdown(void);
+    int fcgym_new_game(FcGameConfig *config);
+    void fcgym_get_observation(FcObservation *obs);
+    void fcgym_free_observation(FcObservation *obs);
+    void fcgym_fill_map_channels(const FcObservation *obs, uint8_t *out, int width, int height);
+    void fcgym_get_valid_actions(FcValidActions *actions);
+    void fcgym_free_valid_actions(FcValidActions *actions);
+    FcStepResult fcgym_step(FcAction *action);
+    const char* fcgym_unit_type_name(int unit_type);
+    const char* fcgym_tech_name(int tech_id);
+"""
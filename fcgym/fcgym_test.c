@@ -990,6 +990,74 @@ int main(int argc, char **argv)
         printf("SKIP: No unit available to attack with\n");
     }
 
+    /* ========== Test 16: Map Channels ========== */
+    printf("\n=== Test 16: Map Channels ===\n");
+    fcgym_get_observation(&obs);
+
+    if (obs.map_xsize > 0 && obs.map_ysize > 0
+        && obs.num_tiles >= obs.map_xsize * obs.map_ysize) {
+        int width = obs.map_xsize;
+        int height = obs.map_ysize;
+        size_t plane = (size_t)width * height;
+        uint8_t *channels = malloc(FCGYM_MAP_CHANNELS * plane);
+        int mismatches = 0;
+
+        fcgym_fill_map_channels(&obs, channels, width, height);
+
+        for (int i = 0; i < width * height; i++) {
+            const FcTileObs *t = &obs.tiles[i];
+            uint8_t expected[FCGYM_MAP_CHANNELS] = {0};
+
+            expected[0] = t->visible ? 255 : (t->explored ? 128 : 0);
+            if (t->explored) {
+                expected[1] = t->terrain >= 0 ? (uint8_t)t->terrain : 0;
+                expected[2] = (t->extras & 0x01) ? 255 : 0;
+                expected[3] = (t->extras & 0x02) ? 255 : 0;
+                expected[4] = (t->extras & 0x04) ? 255 : 0;
+                if (t->owner >= 0) {
+                    expected[5] = t->owner == obs.controlled_player ? 255 : 0;
+                    expected[6] = t->owner != obs.controlled_player ? 255 : 0;
+                }
+                expected[7] = t->has_city ? 255 : 0;
+                expected[8] = t->has_unit ? 255 : 0;
+            }
+
+            for (int c = 0; c < FCGYM_MAP_CHANNELS; c++) {
+                if (channels[c * plane + i] != expected[c]) {
+                    mismatches++;
+                }
+            }
+        }
+        printf("Map %dx%d, %d mismatched channel values\n", width, height, mismatches);
+        TEST_ASSERT(mismatches == 0, "Map channels match tile observation fields");
+
+        /* A smaller buffer gets the top-left crop of the same channels */
+        int crop_w = width > 1 ? width / 2 : 1;
+        int crop_h = height > 1 ? height / 2 : 1;
+        size_t crop_plane = (size_t)crop_w * crop_h;
+        uint8_t *cropped = malloc(FCGYM_MAP_CHANNELS * crop_plane);
+        mismatches = 0;
+
+        fcgym_fill_map_channels(&obs, cropped, crop_w, crop_h);
+
+        for (int c = 0; c < FCGYM_MAP_CHANNELS; c++) {
+            for (int y = 0; y < crop_h; y++) {
+                for (int x = 0; x < crop_w; x++) {
+                    if (cropped[c * crop_plane + (size_t)y * crop_w + x]
+                        != channels[c * plane + (size_t)y * width + x]) {
+                        mismatches++;
+                    }
+                }
+            }
+        }
+        TEST_ASSERT(mismatches == 0, "Cropped map channels match the full map");
+
+        free(cropped);
+        free(channels);
+    } else {
+        printf("SKIP: Observation has no full tile map\n");
+    }
+
     /* ========== Summary ========== */
     printf("\n=== Test Summary ===\n");
     printf("Passed: %d\n", tests_passed);
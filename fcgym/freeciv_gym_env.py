@@ -21,13 +21,17 @@ Observation Space:
 
 import atexit
 import os
+import sys
+import threading
 import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Literal, Union
 from cffi import FFI
 from enum import IntEnum
 
+from fcgym_cdef import FCGYM_CDEF
+
 
 # Constants
 MAX_LEGAL_ACTIONS = 1024  # Configurable cap on legal actions per step
@@ -36,6 +40,27 @@ MAX_CITIES = 64
 MAX_PLAYERS = 8
 MAP_CHANNELS = 9  # visibility, terrain, road, irrigation, mine, ownership_self, ownership_enemy, city, unit_visible
 
+# Reward per point of score gained over a turn. Kept a Python float: the
+# reward is a scalar, and Python float math is cheaper than NumPy scalar math
+_REWARD_SCALE = 0.01
+
+# Initial size of the dense engine-ID -> slot tables (grown on demand)
+_SLOT_TABLE_SIZE = 4096
+# Rows of FreecivGymEnv._id_tables
+_UNIT_TABLE = 0
+_CITY_TABLE = 1
+
+# Max number of formatted ansi render strings kept per env
+_ANSI_CACHE_SIZE = 1024
+
+# Feature normalization scales, as reciprocals so features are multiplied
+_INV_10 = 1.0 / 10.0
+_INV_20 = 1.0 / 20.0
+_INV_30 = 1.0 / 30.0
+_INV_50 = 1.0 / 50.0
+_INV_100 = 1.0 / 100.0
+_INV_1000 = 1.0 / 1000.0
+
 # Module-level library state (shared across all env instances in this process)
 _lib_handle = None
 _library_initialized = False
@@ -63,6 +88,8 @@ def shutdown_library():
     process is started.
     """
     _shutdown_library()
+    # Pooled envs can't run any more either
+    clear_env_pools()
 
 
 class FcActionType(IntEnum):
@@ -82,163 +109,167 @@ class FcActionType(IntEnum):
     NOOP = 12
 
 
-# CFFI setup
-ffi = FFI()
-
-# C definitions for fcgym structs and functions
-# IMPORTANT: These must match fcgym.h exactly for memory layout
-ffi.cdef("""
-    typedef struct {
-        const char *ruleset;
-        int map_xsize;
-        int map_ysize;
-        int num_ai_players;
-        int ai_skill_level;
-        unsigned int seed;
-        bool fog_of_war;
-    } FcGameConfig;
-
-    typedef struct {
-        int terrain;
-        int owner;
-        bool has_city;
-        bool has_unit;
-        bool visible;
-        bool explored;
-        int8_t extras;
-    } FcTileObs;
-
-    typedef struct {
-        int id;
-        int type;
-        int owner;
-        int tile_index;
-        int hp;
-        int max_hp;
-        int moves_left;
-        int veteran_level;
-        bool fortified;
-    } FcUnitObs;
-
-    typedef struct {
-        int id;
-        int owner;
-        int tile_index;
-        int size;
-        int food_stock;
-        int shield_stock;
-        int producing_type;
-        bool producing_is_unit;
-        int turns_to_complete;
-    } FcCityObs;
-
-    typedef struct {
-        int index;
-        bool is_alive;
-        bool is_ai;
-        int gold;
-        int tax_rate;
-        int science_rate;
-        int luxury_rate;
-        int researching;
-        int research_bulbs;
-        int num_cities;
-        int num_units;
-        int score;
-    } FcPlayerObs;
-
-    typedef struct {
-        int map_xsize;
-        int map_ysize;
-
-        int turn;
-        int year;
-        int phase;
-        int current_player;
-        int controlled_player;
-
-        FcTileObs *tiles;
-        int num_tiles;
-
-        FcUnitObs *units;
-        int num_units;
-        int max_units;
-
-        FcCityObs *cities;
-        int num_cities;
-        int max_cities;
-
-        FcPlayerObs *players;
-        int num_players;
-
-        bool game_over;
-        int winner;
-    } FcObservation;
-
-    typedef struct {
-        int unit_id;
-        bool can_move[8];
-        int attackable_tiles[8];
-        int num_attackable_tiles;
-        bool can_fortify;
-        bool can_build_city;
-        bool can_build_road;
-        bool can_build_irrigation;
-        bool can_build_mine;
-        bool can_disband;
-    } FcUnitActions;
-
-    typedef struct {
-        int city_id;
-        int *buildable_units;
-        int num_buildable_units;
-        int *buildable_buildings;
-        int num_buildable_buildings;
-        bool can_buy;
-    } FcCityActions;
-
-    typedef struct {
-        FcUnitActions *unit_actions;
-        int num_unit_actions;
-
-        FcCityActions *city_actions;
-        int num_city_actions;
-
-        int *researchable_techs;
-        int num_researchable_techs;
-
-        bool can_end_turn;
-    } FcValidActions;
-
-    typedef struct {
-        int type;
-        int actor_id;
-        int target_id;
-        int sub_target;
-    } FcAction;
-
-    typedef struct {
-        float reward;
-        bool done;
-        bool truncated;
-        const char *info;
-    } FcStepResult;
-
-    int fcgym_init(void);
-    void fcgym_shutdown(void);
-    int fcgym_new_game(FcGameConfig *config);
-    void fcgym_get_observation(FcObservation *obs);
-    void fcgym_free_observation(FcObservation *obs);
-    void fcgym_get_valid_actions(FcValidActions *actions);
-    void fcgym_free_valid_actions(FcValidActions *actions);
-    FcStepResult fcgym_step(FcAction *action);
-    const char* fcgym_unit_type_name(int unit_type);
-    const char* fcgym_tech_name(int tech_id);
-""")
+# Plain-int action types for hot paths (avoids IntEnum attribute lookups)
+_AT_MOVE = int(FcActionType.UNIT_MOVE)
+_AT_ATTACK = int(FcActionType.UNIT_ATTACK)
+_AT_FORTIFY = int(FcActionType.UNIT_FORTIFY)
+_AT_BUILD_CITY = int(FcActionType.UNIT_BUILD_CITY)
+_AT_BUILD_ROAD = int(FcActionType.UNIT_BUILD_ROAD)
+_AT_BUILD_IRRIGATION = int(FcActionType.UNIT_BUILD_IRRIGATION)
+_AT_BUILD_MINE = int(FcActionType.UNIT_BUILD_MINE)
+_AT_DISBAND = int(FcActionType.UNIT_DISBAND)
+_AT_CITY_BUILD = int(FcActionType.CITY_BUILD)
+_AT_CITY_BUY = int(FcActionType.CITY_BUY)
+_AT_RESEARCH_SET = int(FcActionType.RESEARCH_SET)
+_AT_END_TURN = int(FcActionType.END_TURN)
+_AT_NOOP = int(FcActionType.NOOP)
+
+# Action types whose actor_slot is a unit / city slot
+_UNIT_ACTIONS = frozenset({
+    _AT_MOVE, _AT_ATTACK, _AT_FORTIFY, _AT_BUILD_CITY,
+    _AT_BUILD_ROAD, _AT_BUILD_IRRIGATION, _AT_BUILD_MINE, _AT_DISBAND,
+})
+_CITY_ACTIONS = frozenset({_AT_CITY_BUILD, _AT_CITY_BUY})
+
+
+# CFFI setup: prefer the compiled out-of-line module built by fcgym_build.py
+# (API mode); otherwise parse the cdef and dlopen libfcgym.so (ABI mode).
+try:
+    from _fcgym import ffi, lib as _api_lib
+except ImportError:
+    _api_lib = None
+    ffi = FFI()
+    ffi.cdef(FCGYM_CDEF)
+
+
+def _struct_dtype(ctype: str, fields: List[Tuple[str, Any]]) -> np.dtype:
+    """Build a NumPy dtype matching a cdef'd struct's layout.
+
+    Offsets and itemsize come from CFFI so the dtype always agrees with the
+    C memory layout, allowing np.frombuffer() views over C arrays.
+    """
+    return np.dtype({
+        "names": [name for name, _ in fields],
+        "formats": [fmt for _, fmt in fields],
+        "offsets": [ffi.offsetof(ctype, name) for name, _ in fields],
+        "itemsize": ffi.sizeof(ctype),
+    })
+
+
+_TILE_DTYPE = _struct_dtype("FcTileObs", [
+    ("terrain", np.int32),
+    ("owner", np.int32),
+    ("has_city", np.bool_),
+    ("has_unit", np.bool_),
+    ("visible", np.bool_),
+    ("explored", np.bool_),
+    ("extras", np.int8),
+])
+
+_UNIT_DTYPE = _struct_dtype("FcUnitObs", [
+    ("id", np.int32),
+    ("type", np.int32),
+    ("owner", np.int32),
+    ("tile_index", np.int32),
+    ("hp", np.int32),
+    ("max_hp", np.int32),
+    ("moves_left", np.int32),
+    ("veteran_level", np.int32),
+    ("fortified", np.bool_),
+])
+
+_CITY_DTYPE = _struct_dtype("FcCityObs", [
+    ("id", np.int32),
+    ("owner", np.int32),
+    ("tile_index", np.int32),
+    ("size", np.int32),
+    ("food_stock", np.int32),
+    ("shield_stock", np.int32),
+    ("producing_type", np.int32),
+    ("producing_is_unit", np.bool_),
+    ("turns_to_complete", np.int32),
+])
+
+_PLAYER_DTYPE = _struct_dtype("FcPlayerObs", [
+    ("index", np.int32),
+    ("is_alive", np.bool_),
+    ("is_ai", np.bool_),
+    ("gold", np.int32),
+    ("tax_rate", np.int32),
+    ("science_rate", np.int32),
+    ("luxury_rate", np.int32),
+    ("researching", np.int32),
+    ("research_bulbs", np.int32),
+    ("num_cities", np.int32),
+    ("num_units", np.int32),
+    ("score", np.int32),
+])
+
+
+_INT_DTYPE = np.dtype(np.intc)
+
+_UNIT_ACTIONS_DTYPE = _struct_dtype("FcUnitActions", [
+    ("unit_id", np.int32),
+    ("can_move", (np.bool_, 8)),
+    ("attackable_tiles", (np.int32, 8)),
+    ("num_attackable_tiles", np.int32),
+    ("can_fortify", np.bool_),
+    ("can_build_city", np.bool_),
+    ("can_build_road", np.bool_),
+    ("can_build_irrigation", np.bool_),
+    ("can_build_mine", np.bool_),
+    ("can_disband", np.bool_),
+])
+
+# Once-per-turn unit actions as (type, FcUnitActions flag, sub_target),
+# in legal-action order after the 8 moves and 8 attack slots
+_UNIT_TURN_ACTIONS = (
+    (_AT_FORTIFY, "can_fortify", 0),
+    (_AT_BUILD_CITY, "can_build_city", 0),
+    (_AT_BUILD_ROAD, "can_build_road", -1),
+    (_AT_BUILD_IRRIGATION, "can_build_irrigation", -1),
+    (_AT_BUILD_MINE, "can_build_mine", -1),
+    (_AT_DISBAND, "can_disband", 0),
+)
+_UNIT_CANDIDATES = 16 + len(_UNIT_TURN_ACTIONS)
+
+
+def _c_array(ptr, count: int, dtype: np.dtype) -> np.ndarray:
+    """View `count` C structs at `ptr` as a structured array (no copy).
+
+    The view is only valid until the owning C memory is freed.
+    """
+    if count <= 0 or ptr == ffi.NULL:
+        return np.empty(0, dtype=dtype)
+    return np.frombuffer(ffi.buffer(ptr, count * dtype.itemsize), dtype=dtype)
+
+
+def _lookup_slots(slot_table: np.ndarray, ids) -> np.ndarray:
+    """Map engine IDs to slots via a dense id -> slot table, -1 if absent."""
+    ids = np.asarray(ids, dtype=np.intp)
+    in_range = (ids >= 0) & (ids < slot_table.size)
+    return np.where(in_range, slot_table[np.where(in_range, ids, 0)], -1)
+
+
+def _update_slot_table(slot_table: np.ndarray, old_ids: np.ndarray, new_ids: np.ndarray):
+    """Point slot_table at new_ids' slots, clearing only old_ids' entries.
+
+    new_ids must be sorted (slot i holds new_ids[i]) and fit in the table.
+    """
+    slot_table[old_ids] = -1
+    slot_table[new_ids] = np.arange(new_ids.size, dtype=np.int32)
+
+
+# Path found by _find_library(), reused by later lookups in this process
+_cached_lib_path: Optional[str] = None
 
 
 def _find_library():
     """Find the fcgym library (prefer shared library for CFFI)."""
+    global _cached_lib_path
+    if _cached_lib_path is not None:
+        return _cached_lib_path
+
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Prefer shared library (.so) for CFFI dynamic loading
@@ -250,8 +281,10 @@ def _find_library():
 
     for path in candidates:
         if os.path.exists(path):
+            _cached_lib_path = path
             return path
 
+    # Not cached, so a library built later in the process is still found
     return None
 
 
@@ -272,6 +305,19 @@ class FreecivGymEnv(gym.Env):
     Action space is Discrete(MAX_LEGAL) with:
     - action_mask in info
     - legal_actions array encoding [type, actor_slot, target, sub_target]
+
+    Observations are built in preallocated buffers. With copy_obs=True
+    (default) reset/step return copies; with copy_obs=False they return the
+    buffers themselves, which are overwritten by the next reset/step (fine
+    for vector envs that copy observations out, e.g. AsyncVectorEnv).
+    copy_info works the same way for info["action_mask"] and
+    info["legal_actions"]; with copy_info=False treat them as read-only.
+
+    info_mode="padded" (default) returns those two arrays at their full
+    max_legal_actions size. info_mode="compact" returns only the first
+    num_legal_actions entries, so their length varies per step; use it with
+    consumers that take per-env info dicts (e.g. AsyncPool), not with vector
+    envs that stack info arrays.
     """
 
     metadata = {"render_modes": ["human", "ansi"]}
@@ -287,6 +333,9 @@ class FreecivGymEnv(gym.Env):
         fog_of_war: bool = True,
         max_legal_actions: int = MAX_LEGAL_ACTIONS,
         render_mode: Optional[str] = None,
+        copy_obs: bool = True,
+        copy_info: bool = True,
+        info_mode: Literal["padded", "compact"] = "padded",
     ):
         super().__init__()
 
@@ -299,44 +348,77 @@ class FreecivGymEnv(gym.Env):
         self.fog_of_war = fog_of_war
         self.max_legal_actions = max_legal_actions
         self.render_mode = render_mode
+        # render() output only changes with the legal-action count
+        self._last_rendered_legal = -1
+        self._ansi_cache: Dict[int, str] = {}
+        self.copy_obs = copy_obs
+        self.copy_info = copy_info
+        if info_mode not in ("padded", "compact"):
+            raise ValueError(f"info_mode must be 'padded' or 'compact', got {info_mode!r}")
+        self.info_mode = info_mode
 
         # Load library
         self._lib = None
         self._initialized = False
 
-        # Slot mappings (engine_id -> slot_index)
-        self._unit_id_to_slot: Dict[int, int] = {}
-        self._city_id_to_slot: Dict[int, int] = {}
-        self._slot_to_unit_id: Dict[int, int] = {}
-        self._slot_to_city_id: Dict[int, int] = {}
+        # Slot mappings: slot i holds the i-th smallest engine ID, so
+        # slot -> id is an index into the sorted IDs and id -> slot an index
+        # into a dense table (-1 = no slot), grown as IDs get larger
+        self._sorted_unit_ids = np.empty(0, dtype=np.int32)
+        self._sorted_city_ids = np.empty(0, dtype=np.int32)
+        self._id_tables = np.full((2, _SLOT_TABLE_SIZE), -1, dtype=np.int32)
+
+        # Persistent C structs, reused for every reset/step call.
+        # fcgym_get_observation only (re)allocates the observation's internal
+        # arrays when they are missing or too small, so those are kept for the
+        # whole game and released when a new game starts or on close().
+        self._obs_cdata = ffi.new("FcObservation *")
+        self._valid_cdata = ffi.new("FcValidActions *")
+        self._action_cdata = ffi.new("FcAction *")
+        self._config_cdata = ffi.new("FcGameConfig *")
+        # CFFI requires keeping a reference to the string for char*
+        self._ruleset_buf = ffi.new("char[]", self.ruleset.encode('utf-8'))
 
         # Current legal actions cache
-        self._legal_actions = np.zeros((max_legal_actions, 4), dtype=np.int32)
+        # Legal actions are stored column-wise (types, actor slots, targets,
+        # sub_targets); _legal_actions is the (N, 4) row view exposed in info
+        self._legal_action_cols = np.zeros((4, max_legal_actions), dtype=np.int32)
+        self._action_types, self._action_actors, self._action_targets, self._action_subtargets = self._legal_action_cols
+        self._legal_actions = self._legal_action_cols.T
         self._action_mask = np.zeros(max_legal_actions, dtype=np.float32)
         self._num_legal_actions = 0
 
         # Turn-based reward tracking
         self._current_turn = 0
         self._score_at_turn_start = 0
+        # Index of our player in FcObservation.players, found at reset
+        self._controlled_slot = -1
 
         # Per-turn action limiting: track (action_type, actor_id) taken this turn
         # Decision actions can only be done once per actor per turn
         self._actions_taken_this_turn: set = set()
         self._decision_actions = {
-            FcActionType.UNIT_FORTIFY,
-            FcActionType.UNIT_BUILD_CITY,
-            FcActionType.UNIT_BUILD_ROAD,
-            FcActionType.UNIT_BUILD_IRRIGATION,
-            FcActionType.UNIT_BUILD_MINE,
-            FcActionType.UNIT_DISBAND,
-            FcActionType.CITY_BUILD,
-            FcActionType.CITY_BUY,
-            FcActionType.RESEARCH_SET,  # actor_id=0 for global actions
+            _AT_FORTIFY,
+            _AT_BUILD_CITY,
+            _AT_BUILD_ROAD,
+            _AT_BUILD_IRRIGATION,
+            _AT_BUILD_MINE,
+            _AT_DISBAND,
+            _AT_CITY_BUILD,
+            _AT_CITY_BUY,
+            _AT_RESEARCH_SET,  # actor_id=0 for global actions
         }
 
         # Define spaces
         self._define_spaces()
 
+        # Observation buffers, refilled in place by _build_observation
+        self._obs_bufs = {
+            key: np.zeros(self.observation_space[key].shape, dtype=self.observation_space[key].dtype)
+            for key in ("global", "map", "units", "unit_mask", "cities", "city_mask", "players", "player_mask")
+        }
+        self._map_cbuf = ffi.from_buffer("uint8_t[]", self._obs_bufs["map"])
+
     def _define_spaces(self):
         """Define observation and action spaces."""
         # Global features: turn, year, phase, controlled_player, etc.
@@ -376,6 +458,11 @@ class FreecivGymEnv(gym.Env):
         if self._lib is not None:
             return
 
+        if _api_lib is not None:
+            self._lib = _api_lib
+            _lib_handle = self._lib
+            return
+
         lib_path = _find_library()
         if lib_path is None:
             raise RuntimeError(
@@ -410,165 +497,174 @@ class FreecivGymEnv(gym.Env):
         _library_initialized = True
         self._initialized = True
 
-    def _update_slot_mappings(self, obs):
-        """Update stable slot mappings from observation.
+    @staticmethod
+    def _assign_slots(entities: np.ndarray, controlled: int, max_slots: int):
+        """Assign stable slots to our own entities.
 
         Only our own controllable units/cities are slotted to ensure stability.
         Enemy units appearing/disappearing won't shift our slots.
-        Slots are assigned by sorting engine IDs for consistency.
+        Slots are assigned by sorting engine IDs for consistency, so an
+        entity's slot is the rank of its ID.
+
+        Returns (sorted IDs of our entities, our entities that get an
+        observation row, their slots). Observation rows cover only the first
+        max_slots C entries and slots below max_slots.
         """
+        own = np.flatnonzero(entities["owner"] == controlled)
+        ids = entities["id"][own]
+        order = np.argsort(ids, kind="stable")
+        slots = np.empty(own.size, dtype=np.intp)
+        slots[order] = np.arange(own.size)
+        keep = (own < max_slots) & (slots < max_slots)
+        # Fancy indexing copies, so the IDs outlive the C observation memory
+        return ids[order], entities[own[keep]], slots[keep]
+
+    def _refresh(self) -> Dict[str, np.ndarray]:
+        """Fetch observation and valid actions from fcgym and rebuild all state.
+
+        Units and cities are viewed and slotted once, and that single pass
+        feeds the slot mappings, legal actions and observation. Returns the
+        observation dict; the caller frees the valid actions.
+        """
+        obs = self._obs_cdata
+        self._lib.fcgym_get_observation(obs)
         controlled = obs.controlled_player
 
-        # Get only OUR unit IDs and sort them
-        our_unit_ids = sorted([
-            obs.units[i].id
-            for i in range(obs.num_units)
-            if obs.units[i].owner == controlled
-        ])
-        self._unit_id_to_slot.clear()
-        self._slot_to_unit_id.clear()
-        for slot, uid in enumerate(our_unit_ids):
-            self._unit_id_to_slot[uid] = slot
-            self._slot_to_unit_id[slot] = uid
-
-        # Get only OUR city IDs and sort them
-        our_city_ids = sorted([
-            obs.cities[i].id
-            for i in range(obs.num_cities)
-            if obs.cities[i].owner == controlled
-        ])
-        self._city_id_to_slot.clear()
-        self._slot_to_city_id.clear()
-        for slot, cid in enumerate(our_city_ids):
-            self._city_id_to_slot[cid] = slot
-            self._slot_to_city_id[slot] = cid
+        # Update slot mappings
+        units = _c_array(obs.units, obs.num_units, _UNIT_DTYPE)
+        unit_ids, units, unit_slots = self._assign_slots(units, controlled, MAX_UNITS)
+        cities = _c_array(obs.cities, obs.num_cities, _CITY_DTYPE)
+        city_ids, cities, city_slots = self._assign_slots(cities, controlled, MAX_CITIES)
+
+        # Grow the ID tables to the next power of two if an ID doesn't fit;
+        # the new tables start empty, so clearing old IDs below is harmless
+        max_id = max(unit_ids[-1] if unit_ids.size else 0, city_ids[-1] if city_ids.size else 0)
+        if max_id >= self._id_tables.shape[1]:
+            self._id_tables = np.full((2, 1 << int(max_id).bit_length()), -1, dtype=np.int32)
+        _update_slot_table(self._id_tables[_UNIT_TABLE], self._sorted_unit_ids, unit_ids)
+        _update_slot_table(self._id_tables[_CITY_TABLE], self._sorted_city_ids, city_ids)
+        self._sorted_unit_ids = unit_ids
+        self._sorted_city_ids = city_ids
+
+        # Get valid actions
+        valid = self._valid_cdata
+        self._lib.fcgym_get_valid_actions(valid)
+        self._build_legal_actions(valid)
+
+        # Build observation dict
+        return self._build_observation(obs, units, unit_slots, cities, city_slots)
+
+    def _add_legal_actions(self, idx: int, action_type: int, actor_slot: int, targets, sub_target: int) -> int:
+        """Write one legal action per target starting at idx, up to max_legal_actions.
+
+        Returns the index after the last action written.
+        """
+        end = min(idx + len(targets), self.max_legal_actions)
+        if end <= idx:
+            return idx
+        self._action_types[idx:end] = action_type
+        self._action_actors[idx:end] = actor_slot
+        self._action_targets[idx:end] = targets[:end - idx]
+        self._action_subtargets[idx:end] = sub_target
+        self._action_mask[idx:end] = 1.0
+        return end
 
     def _build_legal_actions(self, valid_actions):
         """Build legal actions array from FcValidActions.
 
         Each legal action is encoded as [type, actor_slot, target, sub_target].
         """
-        self._legal_actions.fill(0)
-        self._action_mask.fill(0)
+        # Everything past the previous call's entries is still zero
+        prev = self._num_legal_actions
+        self._legal_action_cols[:, :prev] = 0
+        self._action_mask[:prev] = 0
         idx = 0
+        taken = self._actions_taken_this_turn
 
         # END_TURN
-        if valid_actions.can_end_turn and idx < self.max_legal_actions:
-            self._legal_actions[idx] = [FcActionType.END_TURN, 0, 0, 0]
-            self._action_mask[idx] = 1.0
-            idx += 1
-
-        # Unit actions
-        for i in range(valid_actions.num_unit_actions):
-            ua = valid_actions.unit_actions[i]
-            unit_id = ua.unit_id
-            if unit_id not in self._unit_id_to_slot:
-                continue
-            slot = self._unit_id_to_slot[unit_id]
+        if valid_actions.can_end_turn:
+            idx = self._add_legal_actions(idx, _AT_END_TURN, 0, (0,), 0)
+
+        # Unit actions, enumerated per unit as a fixed row of candidates
+        # (moves, attacks, then once-per-turn actions) and packed by mask
+        unit_actions = _c_array(valid_actions.unit_actions, valid_actions.num_unit_actions, _UNIT_ACTIONS_DTYPE)
+        unit_slots = _lookup_slots(self._id_tables[_UNIT_TABLE], unit_actions["unit_id"])
+        has_slot = unit_slots >= 0
+        unit_actions, unit_slots = unit_actions[has_slot], unit_slots[has_slot]
+        if unit_slots.size and idx < self.max_legal_actions:
+            # candidates[column, unit, candidate], columns ordered as _legal_action_cols
+            candidates = np.zeros((4, unit_slots.size, _UNIT_CANDIDATES), dtype=np.int32)
+            valid = np.empty((unit_slots.size, _UNIT_CANDIDATES), dtype=bool)
+            candidates[1] = unit_slots[:, None]
 
             # Movement in 8 directions (non-combat moves only)
-            for d in range(8):
-                if ua.can_move[d] and idx < self.max_legal_actions:
-                    self._legal_actions[idx] = [FcActionType.UNIT_MOVE, slot, 0, d]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
-
-            # Attack actions - enumerate from attackable_tiles array
-            for a in range(ua.num_attackable_tiles):
-                if idx < self.max_legal_actions:
-                    target_tile = ua.attackable_tiles[a]
-                    self._legal_actions[idx] = [FcActionType.UNIT_ATTACK, slot, target_tile, 0]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
-
-            # Fortify (once per unit per turn)
-            if ua.can_fortify and idx < self.max_legal_actions:
-                if (FcActionType.UNIT_FORTIFY, slot) not in self._actions_taken_this_turn:
-                    self._legal_actions[idx] = [FcActionType.UNIT_FORTIFY, slot, 0, 0]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
-
-            # Build city (once per unit per turn)
-            if ua.can_build_city and idx < self.max_legal_actions:
-                if (FcActionType.UNIT_BUILD_CITY, slot) not in self._actions_taken_this_turn:
-                    self._legal_actions[idx] = [FcActionType.UNIT_BUILD_CITY, slot, 0, 0]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
-
-            # Build road (once per unit per turn)
-            if ua.can_build_road and idx < self.max_legal_actions:
-                if (FcActionType.UNIT_BUILD_ROAD, slot) not in self._actions_taken_this_turn:
-                    self._legal_actions[idx] = [FcActionType.UNIT_BUILD_ROAD, slot, 0, -1]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
-
-            # Build irrigation (once per unit per turn)
-            if ua.can_build_irrigation and idx < self.max_legal_actions:
-                if (FcActionType.UNIT_BUILD_IRRIGATION, slot) not in self._actions_taken_this_turn:
-                    self._legal_actions[idx] = [FcActionType.UNIT_BUILD_IRRIGATION, slot, 0, -1]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
-
-            # Build mine (once per unit per turn)
-            if ua.can_build_mine and idx < self.max_legal_actions:
-                if (FcActionType.UNIT_BUILD_MINE, slot) not in self._actions_taken_this_turn:
-                    self._legal_actions[idx] = [FcActionType.UNIT_BUILD_MINE, slot, 0, -1]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
-
-            # Disband (once per unit per turn)
-            if ua.can_disband and idx < self.max_legal_actions:
-                if (FcActionType.UNIT_DISBAND, slot) not in self._actions_taken_this_turn:
-                    self._legal_actions[idx] = [FcActionType.UNIT_DISBAND, slot, 0, 0]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
+            candidates[0, :, :8] = _AT_MOVE
+            candidates[3, :, :8] = np.arange(8)
+            valid[:, :8] = unit_actions["can_move"]
+
+            # Attack actions - the first num_attackable_tiles of attackable_tiles
+            candidates[0, :, 8:16] = _AT_ATTACK
+            candidates[2, :, 8:16] = unit_actions["attackable_tiles"]
+            valid[:, 8:16] = np.arange(8) < unit_actions["num_attackable_tiles"][:, None]
+
+            # Fortify, build city/road/irrigation/mine, disband (once per unit per turn)
+            for col, (action_type, flag, sub_target) in enumerate(_UNIT_TURN_ACTIONS, start=16):
+                taken_slots = [slot for taken_type, slot in taken if taken_type == action_type]
+                candidates[0, :, col] = action_type
+                candidates[3, :, col] = sub_target
+                valid[:, col] = unit_actions[flag] & ~np.isin(unit_slots, taken_slots)
+
+            selected = candidates[:, valid][:, :self.max_legal_actions - idx]
+            end = idx + selected.shape[1]
+            self._legal_action_cols[:, idx:end] = selected
+            self._action_mask[idx:end] = 1.0
+            idx = end
 
         # City actions
-        for i in range(valid_actions.num_city_actions):
-            ca = valid_actions.city_actions[i]
-            city_id = ca.city_id
-            if city_id not in self._city_id_to_slot:
+        city_slots = _lookup_slots(self._id_tables[_CITY_TABLE], [
+            valid_actions.city_actions[i].city_id for i in range(valid_actions.num_city_actions)
+        ]).tolist()
+        for i, slot in enumerate(city_slots):
+            if slot < 0:
                 continue
-            slot = self._city_id_to_slot[city_id]
+            ca = valid_actions.city_actions[i]
 
             # Set production (once per city per turn - any production change counts)
-            if (FcActionType.CITY_BUILD, slot) not in self._actions_taken_this_turn:
-                for j in range(ca.num_buildable_units):
-                    if idx < self.max_legal_actions:
-                        unit_type = ca.buildable_units[j]
-                        self._legal_actions[idx] = [FcActionType.CITY_BUILD, slot, unit_type, 0]
-                        self._action_mask[idx] = 1.0
-                        idx += 1
-
-                for j in range(ca.num_buildable_buildings):
-                    if idx < self.max_legal_actions:
-                        bldg_type = ca.buildable_buildings[j]
-                        self._legal_actions[idx] = [FcActionType.CITY_BUILD, slot, bldg_type, 1]
-                        self._action_mask[idx] = 1.0
-                        idx += 1
+            if (_AT_CITY_BUILD, slot) not in taken:
+                idx = self._add_legal_actions(
+                    idx, _AT_CITY_BUILD, slot,
+                    _c_array(ca.buildable_units, ca.num_buildable_units, _INT_DTYPE), 0)
+                idx = self._add_legal_actions(
+                    idx, _AT_CITY_BUILD, slot,
+                    _c_array(ca.buildable_buildings, ca.num_buildable_buildings, _INT_DTYPE), 1)
 
             # Buy (once per city per turn)
-            if ca.can_buy and idx < self.max_legal_actions:
-                if (FcActionType.CITY_BUY, slot) not in self._actions_taken_this_turn:
-                    self._legal_actions[idx] = [FcActionType.CITY_BUY, slot, 0, 0]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
+            if ca.can_buy and (_AT_CITY_BUY, slot) not in taken:
+                idx = self._add_legal_actions(idx, _AT_CITY_BUY, slot, (0,), 0)
 
         # Research (once per turn - actor_id=0 for global actions)
-        if (FcActionType.RESEARCH_SET, 0) not in self._actions_taken_this_turn:
-            for i in range(valid_actions.num_researchable_techs):
-                if idx < self.max_legal_actions:
-                    tech_id = valid_actions.researchable_techs[i]
-                    self._legal_actions[idx] = [FcActionType.RESEARCH_SET, 0, tech_id, 0]
-                    self._action_mask[idx] = 1.0
-                    idx += 1
+        if (_AT_RESEARCH_SET, 0) not in taken:
+            idx = self._add_legal_actions(
+                idx, _AT_RESEARCH_SET, 0,
+                _c_array(valid_actions.researchable_techs, valid_actions.num_researchable_techs, _INT_DTYPE), 0)
 
         self._num_legal_actions = idx
 
-    def _build_observation(self, obs) -> Dict[str, np.ndarray]:
-        """Build observation dict from FcObservation."""
+    def _legal_action_info(self) -> Dict[str, np.ndarray]:
+        """action_mask/legal_actions for info, per info_mode (copied if copy_info)."""
+        action_mask, legal_actions = self._action_mask, self._legal_actions
+        if self.info_mode == "compact":
+            n = self._num_legal_actions
+            action_mask, legal_actions = action_mask[:n], legal_actions[:n]
+        if self.copy_info:
+            return {"action_mask": action_mask.copy(), "legal_actions": legal_actions.copy()}
+        return {"action_mask": action_mask, "legal_actions": legal_actions}
+
+    def _build_observation(self, obs, units: np.ndarray, unit_slots: np.ndarray,
+                           cities: np.ndarray, city_slots: np.ndarray) -> Dict[str, np.ndarray]:
+        """Build observation dict from FcObservation and our slotted units/cities."""
         # Global features
-        global_obs = np.zeros(10, dtype=np.float32)
+        global_obs = self._obs_bufs["global"]
         global_obs[0] = obs.turn
         global_obs[1] = obs.controlled_player
         global_obs[2] = obs.num_players
@@ -580,173 +676,111 @@ class FreecivGymEnv(gym.Env):
         global_obs[8] = obs.current_player
         global_obs[9] = obs.winner if obs.game_over else -1
 
-        # Map observation from tiles
+        # Map observation from tiles, rendered by fcgym in one C pass (CFFI
+        # releases the GIL for the call, so threaded wrappers can overlap it)
         # Channels:
         #   0=visibility, 1=terrain, 2=road, 3=irrigation, 4=mine,
         #   5=ownership_self, 6=ownership_enemy, 7=city, 8=unit_visible
-        map_obs = np.zeros((MAP_CHANNELS, self.map_height, self.map_width), dtype=np.uint8)
+        self._lib.fcgym_fill_map_channels(obs, self._map_cbuf, self.map_width, self.map_height)
         controlled = obs.controlled_player
 
-        for i in range(obs.num_tiles):
-            tile = obs.tiles[i]
-            x = i % obs.map_xsize
-            y = i // obs.map_xsize
-
-            # Skip if out of our observation bounds
-            if x >= self.map_width or y >= self.map_height:
-                continue
-
-            # Channel 0: visibility (255=visible, 128=explored, 0=unknown)
-            if tile.visible:
-                map_obs[0, y, x] = 255
-            elif tile.explored:
-                map_obs[0, y, x] = 128
-            # else: stays 0 (unknown)
-
-            # Only fill other channels if tile has been explored
-            # (C side sets terrain=-1 for unexplored, which becomes 255 as uint8)
-            if tile.explored:
-                # Channel 1: terrain type (only if explored)
-                map_obs[1, y, x] = tile.terrain if tile.terrain >= 0 else 0
-
-                # Channel 2-4: extras (road, irrigation, mine from extras bitfield)
-                if tile.extras & 0x01:
-                    map_obs[2, y, x] = 255  # road
-                if tile.extras & 0x02:
-                    map_obs[3, y, x] = 255  # irrigation
-                if tile.extras & 0x04:
-                    map_obs[4, y, x] = 255  # mine
-
-                # Channel 5-6: ownership
-                if tile.owner >= 0:
-                    if tile.owner == controlled:
-                        map_obs[5, y, x] = 255  # ownership_self
-                    else:
-                        map_obs[6, y, x] = 255  # ownership_enemy
-
-                # Channel 7: city presence
-                if tile.has_city:
-                    map_obs[7, y, x] = 255
-
-                # Channel 8: unit presence (only set when currently visible)
-                if tile.has_unit:
-                    map_obs[8, y, x] = 255
-
-        # Units
-        unit_obs = np.zeros((MAX_UNITS, 10), dtype=np.float32)
-        unit_mask = np.zeros(MAX_UNITS, dtype=np.float32)
-
-        for i in range(min(obs.num_units, MAX_UNITS)):
-            u = obs.units[i]
-            if u.id in self._unit_id_to_slot:
-                slot = self._unit_id_to_slot[u.id]
-                if slot < MAX_UNITS:
-                    # x, y from tile_index
-                    x = u.tile_index % obs.map_xsize
-                    y = u.tile_index // obs.map_xsize
-                    # Owner relative encoding: 0=self, 1=enemy, 2=neutral
-                    owner_rel = 0 if u.owner == controlled else 1
-
-                    unit_obs[slot] = [
-                        x / obs.map_xsize,
-                        y / obs.map_ysize,
-                        u.hp / float(u.max_hp) if u.max_hp > 0 else 0.0,
-                        u.moves_left / 10.0,
-                        u.veteran_level,
-                        u.type,
-                        owner_rel,
-                        1.0 if u.fortified else 0.0,
-                        0.0,  # activity
-                        u.id,  # For debugging
-                    ]
-                    unit_mask[slot] = 1.0
-
-        # Cities
-        city_obs = np.zeros((MAX_CITIES, 10), dtype=np.float32)
-        city_mask = np.zeros(MAX_CITIES, dtype=np.float32)
-
-        for i in range(min(obs.num_cities, MAX_CITIES)):
-            c = obs.cities[i]
-            if c.id in self._city_id_to_slot:
-                slot = self._city_id_to_slot[c.id]
-                if slot < MAX_CITIES:
-                    x = c.tile_index % obs.map_xsize
-                    y = c.tile_index // obs.map_xsize
-                    owner_rel = 0 if c.owner == controlled else 1
-
-                    city_obs[slot] = [
-                        x / obs.map_xsize,
-                        y / obs.map_ysize,
-                        c.size / 30.0,
-                        c.food_stock / 100.0,
-                        c.shield_stock / 100.0,
-                        c.producing_type,
-                        1.0 if c.producing_is_unit else 0.0,
-                        c.turns_to_complete / 50.0,
-                        owner_rel,
-                        c.id,
-                    ]
-                    city_mask[slot] = 1.0
+        # Units and cities: scatter our entities into their stable slots.
+        # Slot = rank of the engine ID among our sorted IDs.
+        xsize = obs.map_xsize
+        inv_xsize = 1.0 / xsize if xsize else 0.0
+        inv_ysize = 1.0 / obs.map_ysize if obs.map_ysize else 0.0
+
+        unit_obs = self._obs_bufs["units"]
+        unit_obs.fill(0)
+        unit_mask = self._obs_bufs["unit_mask"]
+        unit_mask.fill(0)
+
+        if unit_slots.size:
+            tile_index = units["tile_index"]
+            max_hp = units["max_hp"]
+            unit_obs[unit_slots, 0] = (tile_index % xsize) * inv_xsize
+            unit_obs[unit_slots, 1] = (tile_index // xsize) * inv_ysize
+            unit_obs[unit_slots, 2] = np.divide(
+                units["hp"], max_hp, out=np.zeros(unit_slots.size), where=max_hp > 0
+            )
+            unit_obs[unit_slots, 3] = units["moves_left"] * _INV_10
+            unit_obs[unit_slots, 4] = units["veteran_level"]
+            unit_obs[unit_slots, 5] = units["type"]
+            # Owner relative encoding: 0=self, 1=enemy, 2=neutral
+            unit_obs[unit_slots, 6] = units["owner"] != controlled
+            unit_obs[unit_slots, 7] = units["fortified"]
+            # Column 8: activity (always 0.0)
+            unit_obs[unit_slots, 9] = units["id"]  # For debugging
+            unit_mask[unit_slots] = 1.0
+
+        city_obs = self._obs_bufs["cities"]
+        city_obs.fill(0)
+        city_mask = self._obs_bufs["city_mask"]
+        city_mask.fill(0)
+
+        if city_slots.size:
+            tile_index = cities["tile_index"]
+            city_obs[city_slots, 0] = (tile_index % xsize) * inv_xsize
+            city_obs[city_slots, 1] = (tile_index // xsize) * inv_ysize
+            city_obs[city_slots, 2] = cities["size"] * _INV_30
+            city_obs[city_slots, 3] = cities["food_stock"] * _INV_100
+            city_obs[city_slots, 4] = cities["shield_stock"] * _INV_100
+            city_obs[city_slots, 5] = cities["producing_type"]
+            city_obs[city_slots, 6] = cities["producing_is_unit"]
+            city_obs[city_slots, 7] = cities["turns_to_complete"] * _INV_50
+            city_obs[city_slots, 8] = cities["owner"] != controlled
+            city_obs[city_slots, 9] = cities["id"]
+            city_mask[city_slots] = 1.0
 
         # Players
-        player_obs = np.zeros((MAX_PLAYERS, 12), dtype=np.float32)
-        player_mask = np.zeros(MAX_PLAYERS, dtype=np.float32)
-
-        for i in range(min(obs.num_players, MAX_PLAYERS)):
-            p = obs.players[i]
-            player_obs[i] = [
-                p.gold / 1000.0,
-                p.tax_rate / 100.0,
-                p.science_rate / 100.0,
-                p.luxury_rate / 100.0,
-                p.research_bulbs / 100.0,
-                p.num_cities / 20.0,
-                p.num_units / 50.0,
-                p.score / 1000.0,
-                1.0 if p.is_alive else 0.0,
-                1.0 if p.is_ai else 0.0,
-                p.researching,
-                p.index,
-            ]
-            player_mask[i] = 1.0 if p.is_alive else 0.0
-
-        return {
-            "global": global_obs,
-            "map": map_obs,
-            "units": unit_obs,
-            "unit_mask": unit_mask,
-            "cities": city_obs,
-            "city_mask": city_mask,
-            "players": player_obs,
-            "player_mask": player_mask,
-        }
+        player_obs = self._obs_bufs["players"]
+        player_obs.fill(0)
+        player_mask = self._obs_bufs["player_mask"]
+        player_mask.fill(0)
+
+        players = _c_array(obs.players, min(obs.num_players, MAX_PLAYERS), _PLAYER_DTYPE)
+        n = players.size
+        player_obs[:n, 0] = players["gold"] * _INV_1000
+        player_obs[:n, 1] = players["tax_rate"] * _INV_100
+        player_obs[:n, 2] = players["science_rate"] * _INV_100
+        player_obs[:n, 3] = players["luxury_rate"] * _INV_100
+        player_obs[:n, 4] = players["research_bulbs"] * _INV_100
+        player_obs[:n, 5] = players["num_cities"] * _INV_20
+        player_obs[:n, 6] = players["num_units"] * _INV_50
+        player_obs[:n, 7] = players["score"] * _INV_1000
+        player_obs[:n, 8] = players["is_alive"]
+        player_obs[:n, 9] = players["is_ai"]
+        player_obs[:n, 10] = players["researching"]
+        player_obs[:n, 11] = players["index"]
+        player_mask[:n] = players["is_alive"]
+
+        if self.copy_obs:
+            return {key: buf.copy() for key, buf in self._obs_bufs.items()}
+        return dict(self._obs_bufs)
 
     def _decode_action(self, action_idx: int) -> Tuple[int, int, int, int]:
         """Decode action index to (type, actor_id, target_id, sub_target)."""
         if action_idx < 0 or action_idx >= self._num_legal_actions:
             # Invalid action - return NOOP
-            return (FcActionType.NOOP, 0, 0, 0)
+            return (_AT_NOOP, 0, 0, 0)
 
-        action = self._legal_actions[action_idx]
-        action_type = int(action[0])
-        actor_slot = int(action[1])
-        target = int(action[2])
-        sub_target = int(action[3])
+        # .item() on the 1D columns yields Python ints without NumPy scalars
+        action_type = self._action_types.item(action_idx)
+        actor_slot = self._action_actors.item(action_idx)
+        target = self._action_targets.item(action_idx)
+        sub_target = self._action_subtargets.item(action_idx)
 
         # Convert slot back to engine ID
-        if action_type in (FcActionType.UNIT_MOVE, FcActionType.UNIT_ATTACK,
-                           FcActionType.UNIT_FORTIFY, FcActionType.UNIT_BUILD_CITY,
-                           FcActionType.UNIT_BUILD_ROAD, FcActionType.UNIT_BUILD_IRRIGATION,
-                           FcActionType.UNIT_BUILD_MINE, FcActionType.UNIT_DISBAND):
-            if actor_slot in self._slot_to_unit_id:
-                actor_id = self._slot_to_unit_id[actor_slot]
+        if action_type in _UNIT_ACTIONS:
+            if 0 <= actor_slot < self._sorted_unit_ids.size:
+                actor_id = self._sorted_unit_ids.item(actor_slot)
             else:
-                return (FcActionType.NOOP, 0, 0, 0)
-        elif action_type in (FcActionType.CITY_BUILD, FcActionType.CITY_BUY):
-            if actor_slot in self._slot_to_city_id:
-                actor_id = self._slot_to_city_id[actor_slot]
+                return (_AT_NOOP, 0, 0, 0)
+        elif action_type in _CITY_ACTIONS:
+            if 0 <= actor_slot < self._sorted_city_ids.size:
+                actor_id = self._sorted_city_ids.item(actor_slot)
             else:
-                return (FcActionType.NOOP, 0, 0, 0)
+                return (_AT_NOOP, 0, 0, 0)
         else:
             actor_id = 0
 
@@ -764,10 +798,11 @@ class FreecivGymEnv(gym.Env):
         # Initialize library if needed
         self._init_fcgym()
 
+        # Previous game's observation arrays may be sized for another map
+        self._free_observation()
+
         # Create game config
-        config = ffi.new("FcGameConfig *")
-        # CFFI requires keeping a reference to the string for char*
-        self._ruleset_buf = ffi.new("char[]", self.ruleset.encode('utf-8'))
+        config = self._config_cdata
         config.ruleset = self._ruleset_buf
         config.map_xsize = self.map_width
         config.map_ysize = self.map_height
@@ -780,45 +815,59 @@ class FreecivGymEnv(gym.Env):
         if result != 0:
             raise RuntimeError("Failed to create new game")
 
-        # Get initial observation
-        obs = ffi.new("FcObservation *")
-        self._lib.fcgym_get_observation(obs)
-
-        # Update slot mappings
-        self._update_slot_mappings(obs)
-
-        # Get valid actions
-        valid = ffi.new("FcValidActions *")
-        self._lib.fcgym_get_valid_actions(valid)
-        self._build_legal_actions(valid)
-
-        # Build observation dict
-        observation = self._build_observation(obs)
+        # Get initial observation, slot mappings and legal actions
+        observation = self._refresh()
+        obs = self._obs_cdata
 
         info = {
             "turn": obs.turn,
-            "action_mask": self._action_mask.copy(),
-            "legal_actions": self._legal_actions.copy(),  # Full fixed-size array
+            **self._legal_action_info(),
             "num_legal_actions": self._num_legal_actions,
         }
 
         # Initialize turn-based reward tracking
         self._current_turn = obs.turn
+        self._controlled_slot = -1
         self._score_at_turn_start = self._get_our_score(obs)
         self._actions_taken_this_turn.clear()
+        # A new episode's first frame is always rendered in "human" mode
+        self._last_rendered_legal = -1
 
-        # Free C memory
-        self._lib.fcgym_free_observation(obs)
-        self._lib.fcgym_free_valid_actions(valid)
+        # Free C memory (observation arrays are kept for the next step)
+        self._lib.fcgym_free_valid_actions(self._valid_cdata)
 
         return observation, info
 
+    def _free_observation(self):
+        """Release the C arrays held by the persistent FcObservation."""
+        if self._lib is not None:
+            self._lib.fcgym_free_observation(self._obs_cdata)
+
+    def __del__(self):
+        # The observation arrays are otherwise only freed by reset()/close(),
+        # so an env dropped without close() would leak them. getattr since
+        # __init__ may have failed before _lib was set.
+        if getattr(self, "_lib", None) is not None:
+            self._free_observation()
+
     def _get_our_score(self, obs) -> int:
         """Get controlled player's current score."""
         controlled = obs.controlled_player
+
+        # Player order is fixed within a game, so the cached slot normally
+        # still holds our player; rescan only if it doesn't
+        slot = self._controlled_slot
+        if 0 <= slot < obs.num_players and obs.players[slot].index == controlled:
+            return obs.players[slot].score
+
+        # Few players, so a plain loop beats building a NumPy view here
+        players = obs.players
         for i in range(obs.num_players):
-            if obs.players[i].index == controlled:
-                return obs.players[i].score
+            player = players[i]
+            if player.index == controlled:
+                self._controlled_slot = i
+                return player.score
+        self._controlled_slot = -1
         return 0
 
     def step(self, action: int) -> Tuple[Dict[str, np.ndarray], float, bool, bool, Dict[str, Any]]:
@@ -826,74 +875,75 @@ class FreecivGymEnv(gym.Env):
         # Decode action
         action_type, actor_id, target_id, sub_target = self._decode_action(action)
 
-        # Create FcAction
-        fc_action = ffi.new("FcAction *")
+        # Fill FcAction
+        fc_action = self._action_cdata
         fc_action.type = action_type
         fc_action.actor_id = actor_id
         fc_action.target_id = target_id
         fc_action.sub_target = sub_target
 
         # Execute action
-        result = self._lib.fcgym_step(fc_action)
+        lib = self._lib
+        result = lib.fcgym_step(fc_action)
 
         # Track decision actions for per-turn limiting
         if action_type in self._decision_actions:
             self._actions_taken_this_turn.add((action_type, actor_id))
 
-        # Get new observation
-        obs = ffi.new("FcObservation *")
-        self._lib.fcgym_get_observation(obs)
-
-        # Update slot mappings
-        self._update_slot_mappings(obs)
-
-        # Get valid actions
-        valid = ffi.new("FcValidActions *")
-        self._lib.fcgym_get_valid_actions(valid)
-        self._build_legal_actions(valid)
-
-        # Build observation dict
-        observation = self._build_observation(obs)
+        # Get new observation, slot mappings and legal actions
+        observation = self._refresh()
+        obs = self._obs_cdata
+        # Each CFFI field access builds a new Python object, so read once
+        turn = obs.turn
+        result_info = result.info
 
         terminated = result.done or obs.game_over
         truncated = result.truncated
 
         # Turn-based rewards: only give reward when turn ends
-        turn_ended = (action_type == FcActionType.END_TURN) or (obs.turn != self._current_turn)
+        turn_ended = (action_type == _AT_END_TURN) or (turn != self._current_turn)
 
         if turn_ended or terminated:
             # Reward = score change since turn start
             current_score = self._get_our_score(obs)
-            reward = (current_score - self._score_at_turn_start) * 0.01  # Scale factor
+            reward = (current_score - self._score_at_turn_start) * _REWARD_SCALE
             self._score_at_turn_start = current_score
-            self._current_turn = obs.turn
+            self._current_turn = turn
             # Reset per-turn action tracking for new turn
             self._actions_taken_this_turn.clear()
         else:
             reward = 0.0  # No reward until turn ends
 
         info = {
-            "turn": obs.turn,
-            "action_mask": self._action_mask.copy(),
-            "legal_actions": self._legal_actions.copy(),  # Full fixed-size array
+            "turn": turn,
+            **self._legal_action_info(),
             "num_legal_actions": self._num_legal_actions,
-            "step_info": ffi.string(result.info).decode('utf-8') if result.info != ffi.NULL else "",
+            "step_info": ffi.string(result_info).decode('utf-8') if result_info != ffi.NULL else "",
         }
 
-        # Free C memory
-        self._lib.fcgym_free_observation(obs)
-        self._lib.fcgym_free_valid_actions(valid)
+        # Free C memory (observation arrays are kept for the next step)
+        lib.fcgym_free_valid_actions(self._valid_cdata)
 
         return observation, reward, terminated, truncated, info
 
 
     def render(self) -> Optional[str]:
         """Render the current game state."""
+        n = self._num_legal_actions
         if self.render_mode == "human":
-            print(f"Turn: {self._num_legal_actions} legal actions")
+            # Only write when something changed
+            if n != self._last_rendered_legal:
+                self._last_rendered_legal = n
+                sys.stdout.write(f"Turn: {n} legal actions\n")
             return None
         elif self.render_mode == "ansi":
-            return f"Legal actions: {self._num_legal_actions}"
+            text = self._ansi_cache.get(n)
+            if text is None:
+                if len(self._ansi_cache) >= _ANSI_CACHE_SIZE:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    del self._ansi_cache[next(iter(self._ansi_cache))]
+                text = self._ansi_cache[n] = "Legal actions: " + str(n)
+            return text
         return None
 
     def close(self):
@@ -904,14 +954,116 @@ class FreecivGymEnv(gym.Env):
         on process exit via atexit. To explicitly shutdown, use shutdown_library().
         """
         # Clear instance state but don't touch the shared library
+        self._free_observation()
         self._initialized = False
         self._lib = None
-        self._unit_id_to_slot.clear()
-        self._city_id_to_slot.clear()
-        self._slot_to_unit_id.clear()
-        self._slot_to_city_id.clear()
+        self._reset_instance_state()
+
+    def _reset_instance_state(self):
+        """Return per-game Python state to its just-constructed values.
+
+        Buffers, spaces and persistent cdata are kept, so a closed env can be
+        reused without reallocating them.
+        """
+        self._sorted_unit_ids = np.empty(0, dtype=np.int32)
+        self._sorted_city_ids = np.empty(0, dtype=np.int32)
+        self._id_tables.fill(-1)
+        prev = self._num_legal_actions
+        self._legal_action_cols[:, :prev] = 0
+        self._action_mask[:prev] = 0
+        self._num_legal_actions = 0
+        self._current_turn = 0
+        self._score_at_turn_start = 0
+        self._controlled_slot = -1
+        self._actions_taken_this_turn.clear()
+        self._last_rendered_legal = -1
+
+
+# Closed envs from make_freeciv_gym_env(pooled=True), available for reuse,
+# keyed by their sorted constructor kwargs (keys are dropped once empty).
+# At most _ENV_POOL_MAX_PER_KEY envs are kept per key and _ENV_POOL_MAX_SIZE
+# in total, evicting from the oldest key first. The lock guards the pools
+# (envs may be created/closed from threads).
+_ENV_POOL_MAX_PER_KEY = 2
+_ENV_POOL_MAX_SIZE = 8
+_ENV_POOLS: Dict[Tuple[Tuple[str, Any], ...], List[FreecivGymEnv]] = {}
+_ENV_POOL_LOCK = threading.Lock()
+
+
+def clear_env_pools():
+    """Drop all pooled envs so they can be garbage collected."""
+    with _ENV_POOL_LOCK:
+        _ENV_POOLS.clear()
 
 
-def make_freeciv_gym_env(**kwargs) -> FreecivGymEnv:
-    """Create a FreecivGymEnv with default settings."""
-    return FreecivGymEnv(**kwargs)
+class PooledFreecivGymEnv(gym.Wrapper):
+    """One checkout of a pooled FreecivGymEnv.
+
+    close() closes the env and returns it to its pool the first time it is
+    called; after that the handle is detached, so further close() calls are
+    no-ops and reset()/step()/render() raise.
+    """
+
+    def __init__(self, env: FreecivGymEnv, pool_key: Tuple[Tuple[str, Any], ...]):
+        super().__init__(env)
+        self._pool_key = pool_key
+        self._released = False
+
+    def _check_checked_out(self):
+        if self._released:
+            raise RuntimeError("Env was closed and returned to its pool; get a new one from make_freeciv_gym_env")
+
+    def reset(self, *, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None):
+        self._check_checked_out()
+        return self.env.reset(seed=seed, options=options)
+
+    def step(self, action):
+        self._check_checked_out()
+        return self.env.step(action)
+
+    def render(self):
+        self._check_checked_out()
+        return self.env.render()
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        env = self.env
+        env.close()
+        with _ENV_POOL_LOCK:
+            pool = _ENV_POOLS.setdefault(self._pool_key, [])
+            if len(pool) >= _ENV_POOL_MAX_PER_KEY:
+                return
+            pool.append(env)
+            size = sum(len(p) for p in _ENV_POOLS.values())
+            while size > _ENV_POOL_MAX_SIZE:
+                oldest_key = next(iter(_ENV_POOLS))
+                oldest = _ENV_POOLS[oldest_key]
+                oldest.pop(0)
+                if not oldest:
+                    del _ENV_POOLS[oldest_key]
+                size -= 1
+
+
+def make_freeciv_gym_env(pooled: bool = False, **kwargs) -> Union[FreecivGymEnv, PooledFreecivGymEnv]:
+    """Create a FreecivGymEnv with default settings.
+
+    With pooled=True, the env is taken from a pool of closed envs built with
+    the same kwargs when one is available, and is returned wrapped in a
+    PooledFreecivGymEnv whose close() puts it back in the pool (see
+    clear_env_pools()). The pooled env's buffers are reused by its next
+    owner, so with copy_obs=False don't hold on to observations past close().
+    """
+    if not pooled:
+        return FreecivGymEnv(**kwargs)
+
+    key = tuple(sorted(kwargs.items()))
+    with _ENV_POOL_LOCK:
+        pool = _ENV_POOLS.get(key)
+        env = pool.pop() if pool else None
+        if pool is not None and not pool:
+            del _ENV_POOLS[key]
+    if env is None:
+        env = FreecivGymEnv(**kwargs)
+    return PooledFreecivGymEnv(env, key)
@@ -0,0 +1,349 @@
+"""
+Subprocess worker pool for running many FreecivGymEnv instances in parallel.
+
+fcgym uses global Freeciv state, so each env lives in its own worker process.
+Workers cannot host several envs (e.g. a SyncVectorEnv chunk per worker):
+a second FreecivGymEnv in the same process would reset the first one's game.
+Each env therefore costs one pipe round trip per step, whatever the
+batch_size; batch_size only sets how many results each recv() waits for
+(smaller hides slow envs better, larger gives bigger policy batches).
+
+AsyncPool follows the EnvPool send/recv model: actions are dispatched to a
+subset of envs with send(), and recv() returns as soon as the first
+batch_size envs have finished stepping. With batch_size < num_envs, slow
+envs (long AI turns) keep running in the background instead of stalling
+the whole batch.
+
+Usage:
+    pool = AsyncPool([make_env] * 8, batch_size=4)
+    pool.async_reset(seed=123)
+    while training:
+        obs, rewards, terminated, truncated, infos, env_ids = pool.recv()
+        pool.send(policy(obs, infos), env_ids)
+    pool.close()
+
+Episodes auto-reset on the step after they end (the action sent for that
+step is ignored), matching gymnasium's default vector-env behavior.
+
+By default observations are passed through shared memory: each worker
+allocates one SharedMemory block per observation key, writes obs in place,
+and only reward/flags/info go over the pipe. This avoids pickling the
+(C, H, W) map and entity arrays on every step.
+
+FreecivSubprocVecEnv wraps an AsyncPool that waits for every env as a
+gymnasium VectorEnv, for code that expects the synchronous
+reset()/step() API (e.g. in place of gym.vector.AsyncVectorEnv):
+
+    envs = FreecivSubprocVecEnv([make_env] * 8)
+    obs, infos = envs.reset(seed=123)
+    obs, rewards, terminated, truncated, infos = envs.step(actions)
+"""
+
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import CloudpickleWrapper, batch_space
+
+
+def _worker(conn, env_fn, shared_memory):
+    """Worker process loop: owns one env and serves reset/step commands.
+
+    The first message sent back is (layout, observation_space, action_space),
+    where layout is the shared-memory layout ({key: (shm_name, shape, dtype)},
+    or None when shared memory is off).
+    """
+    env = None
+    shms: Dict[str, SharedMemory] = {}
+    views: Dict[str, np.ndarray] = {}
+
+    def pack(obs):
+        # With shared memory, obs is written in place and not sent
+        if not views:
+            return obs
+        for key, view in views.items():
+            view[...] = obs[key]
+        return None
+
+    try:
+        env = env_fn()
+        layout = None
+        if shared_memory:
+            for key, space in env.observation_space.spaces.items():
+                shm = SharedMemory(create=True, size=max(1, int(np.prod(space.shape)) * space.dtype.itemsize))
+                shms[key] = shm
+                views[key] = np.ndarray(space.shape, dtype=space.dtype, buffer=shm.buf)
+            layout = {key: (shms[key].name, view.shape, view.dtype.str) for key, view in views.items()}
+        conn.send((True, (layout, env.observation_space, env.action_space)))
+
+        needs_reset = False
+        while True:
+            command, data = conn.recv()
+
+            if command == "reset":
+                obs, info = env.reset(seed=data)
+                needs_reset = False
+                conn.send((True, (pack(obs), 0.0, False, False, info)))
+            elif command == "step":
+                if needs_reset:
+                    obs, info = env.reset()
+                    reward, terminated, truncated = 0.0, False, False
+                else:
+                    obs, reward, terminated, truncated, info = env.step(data)
+                needs_reset = terminated or truncated
+                conn.send((True, (pack(obs), reward, terminated, truncated, info)))
+            elif command == "close":
+                break
+            else:
+                raise RuntimeError(f"Unknown worker command: {command}")
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception as e:
+        conn.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        if env is not None:
+            env.close()
+        views.clear()
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+        conn.close()
+
+
+class AsyncPool:
+    """
+    EnvPool-style asynchronous pool of envs, one subprocess per env.
+
+    Args:
+        env_fns: Callables that each construct one env (run inside the worker).
+        batch_size: Number of env results returned by each recv().
+            Defaults to max(1, num_envs // 2).
+        context: multiprocessing start method. "spawn" is the safe default
+            because each worker needs fresh global Freeciv state.
+        shared_memory: Pass observations through per-worker SharedMemory
+            buffers instead of pickling them over the pipe. Requires a Dict
+            observation space of Box spaces.
+    """
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], Any]],
+        batch_size: Optional[int] = None,
+        context: str = "spawn",
+        shared_memory: bool = True,
+    ):
+        self.num_envs = len(env_fns)
+        if self.num_envs == 0:
+            raise ValueError("AsyncPool needs at least one env")
+
+        self.batch_size = batch_size if batch_size is not None else max(1, self.num_envs // 2)
+        if not 1 <= self.batch_size <= self.num_envs:
+            raise ValueError(
+                f"batch_size must be in [1, {self.num_envs}], got {self.batch_size}"
+            )
+
+        ctx = mp.get_context(context)
+        self._conns = []
+        self._processes = []
+        for env_fn in env_fns:
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(child_conn, CloudpickleWrapper(env_fn), shared_memory),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+        # Envs that have been sent a command and not yet received from
+        self._in_flight: set = set()
+        self._closed = False
+
+        # Attach to each worker's observation buffers
+        self._shms: List[Dict[str, SharedMemory]] = []
+        self._obs_views: List[Dict[str, np.ndarray]] = []
+        for env_id, conn in enumerate(self._conns):
+            try:
+                ok, payload = conn.recv()
+            except (EOFError, OSError) as e:
+                # Worker died before its handshake (e.g. env_fn crashed the process)
+                self.close()
+                raise RuntimeError(f"Env {env_id} worker failed during startup: {e!r}") from e
+            if not ok:
+                self.close()
+                raise RuntimeError(f"Env {env_id} worker failed: {payload}")
+            layout, observation_space, action_space = payload
+            if env_id == 0:
+                self.single_observation_space = observation_space
+                self.single_action_space = action_space
+            shms = {}
+            views = {}
+            for key, (name, shape, dtype) in (layout or {}).items():
+                shms[key] = SharedMemory(name=name)
+                views[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shms[key].buf)
+            self._shms.append(shms)
+            self._obs_views.append(views)
+
+    def async_reset(self, seed: Optional[int] = None):
+        """Reset every env. Env i is seeded with seed + i (if seed is given).
+
+        Results are collected through recv() like step results. All envs
+        must be idle: an in-flight step's reply would be read as the reset's.
+        """
+        if self._in_flight:
+            raise RuntimeError(
+                f"Envs {sorted(self._in_flight)} are still stepping; call recv() first"
+            )
+        for i, conn in enumerate(self._conns):
+            conn.send(("reset", None if seed is None else seed + i))
+            self._in_flight.add(i)
+
+    def send(self, actions: Sequence[int], env_ids: Sequence[int]):
+        """Dispatch one action to each of the given envs without waiting."""
+        for action, env_id in zip(actions, env_ids):
+            env_id = int(env_id)
+            if env_id in self._in_flight:
+                raise RuntimeError(f"Env {env_id} is already stepping; call recv() first")
+            self._conns[env_id].send(("step", int(action)))
+            self._in_flight.add(env_id)
+
+    def recv(self) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]], np.ndarray]:
+        """Wait for the first batch_size in-flight envs to finish.
+
+        Returns (obs, rewards, terminated, truncated, infos, env_ids), where
+        obs values are stacked along axis 0 in env_ids order and infos is a
+        list of the per-env info dicts.
+        """
+        if not self._in_flight:
+            raise RuntimeError("No envs in flight; call send() or async_reset() first")
+
+        target = min(self.batch_size, len(self._in_flight))
+        pending = {self._conns[i]: i for i in self._in_flight}
+        env_ids: List[int] = []
+        while len(env_ids) < target:
+            for conn in wait(list(pending)):
+                env_ids.append(pending.pop(conn))
+                if len(env_ids) == target:
+                    break
+
+        results = []
+        for env_id in env_ids:
+            ok, payload = self._conns[env_id].recv()
+            self._in_flight.discard(env_id)
+            if not ok:
+                raise RuntimeError(f"Env {env_id} worker failed: {payload}")
+            results.append(payload)
+
+        obs_list, rewards, terminated, truncated, infos = zip(*results)
+        if obs_list[0] is None:
+            # Copy out of shared memory: the worker overwrites it on its next step
+            obs_list = [self._obs_views[env_id] for env_id in env_ids]
+        obs = {key: np.stack([o[key] for o in obs_list]) for key in obs_list[0]}
+
+        return (
+            obs,
+            np.array(rewards, dtype=np.float64),
+            np.array(terminated, dtype=bool),
+            np.array(truncated, dtype=bool),
+            list(infos),
+            np.array(env_ids, dtype=np.int64),
+        )
+
+    def close(self):
+        """Shut down all workers."""
+        if self._closed:
+            return
+        self._closed = True
+
+        # Drain in-flight results so workers aren't blocked on send()
+        for env_id in list(self._in_flight):
+            try:
+                self._conns[env_id].recv()
+            except (EOFError, OSError):
+                pass
+        self._in_flight.clear()
+
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+
+        for views in self._obs_views:
+            views.clear()
+        for shms in self._shms:
+            for shm in shms.values():
+                shm.close()
+
+
+class FreecivSubprocVecEnv(VectorEnv):
+    """
+    Gymnasium VectorEnv backed by an AsyncPool that steps all envs together.
+
+    Results are returned in env order with next-step autoreset, and infos are
+    batched with "_key" masks like gymnasium's own vector envs. Observations
+    travel through the pool's shared memory rather than over the pipe.
+
+    Args:
+        env_fns: Callables that each construct one env (run inside the worker).
+        context: multiprocessing start method (see AsyncPool).
+        shared_memory: Pass observations through shared memory (see AsyncPool).
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], Any]],
+        context: str = "spawn",
+        shared_memory: bool = True,
+    ):
+        self._pool = AsyncPool(env_fns, batch_size=len(env_fns), context=context, shared_memory=shared_memory)
+        self.num_envs = self._pool.num_envs
+        self.single_observation_space = self._pool.single_observation_space
+        self.single_action_space = self._pool.single_action_space
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+    def reset(self, *, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None):
+        """Reset every env. Env i is seeded with seed + i (if seed is given)."""
+        if options:
+            raise ValueError("FreecivSubprocVecEnv.reset() does not support options")
+        self._pool.async_reset(seed=seed)
+        obs, _, _, _, infos = self._recv_all()
+        return obs, infos
+
+    def step(self, actions):
+        """Step every env with its action and wait for all of them."""
+        self._pool.send(actions, range(self.num_envs))
+        return self._recv_all()
+
+    def _recv_all(self):
+        obs, rewards, terminated, truncated, infos, env_ids = self._pool.recv()
+        # recv() returns envs in completion order; restore env order
+        order = np.argsort(env_ids)
+        vector_infos: Dict[str, Any] = {}
+        for env_num, i in enumerate(order):
+            vector_infos = self._add_info(vector_infos, infos[i], env_num)
+        return (
+            {key: value[order] for key, value in obs.items()},
+            rewards[order],
+            terminated[order],
+            truncated[order],
+            vector_infos,
+        )
+
+    def close_extras(self, **kwargs: Any):
+        """Shut down the worker pool."""
+        self._pool.close()